@@ -1,23 +1,26 @@
 # mkdocs_build.py — robust JSONL reader + YAML-safe quoting + clean nav
-import json, os, re, unicodedata, pathlib
+import json, os, re, unicodedata
+import orjson
 
 # ---------- helpers ----------
+_SLUG = re.compile(r"[^a-zA-Z0-9]+")
+
 def slugify(s: str) -> str:
     s = (s or "article")
     s = unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
-    s = re.sub(r"[^a-zA-Z0-9]+", "-", s).strip("-").lower()
+    s = _SLUG.sub("-", s).strip("-").lower()
     return s or "article"
 
 def safe_yaml_str(s: str) -> str:
     """
-    Make a string YAML-safe for use inside double quotes.
-    YAML escapes a double-quote by doubling it: "".
+    Make a string YAML-safe for use inside single quotes.
+    YAML escapes a single quote by doubling it: ''.
     Also collapse newlines to spaces.
     """
     if s is None:
         s = ""
     s = str(s)
-    s = s.replace('"', '""')
+    s = s.replace("'", "''")
     s = s.replace("\r", " ").replace("\n", " ")
     return s
 
@@ -27,12 +30,21 @@ def iter_jsonl_robust(fp):
     - multiple JSON objects concatenated on one physical line
     - stray non-JSON characters before/after objects
     - embedded whitespace/commas between objects
+    Expects a binary file; well-formed lines take the orjson fast path.
     """
     dec = json.JSONDecoder()
     for raw in fp:
         s = raw.strip()
         if not s:
             continue
+        try:
+            obj = orjson.loads(s)
+        except orjson.JSONDecodeError:
+            obj = None
+        if isinstance(obj, dict):
+            yield obj
+            continue
+        s = s.decode("utf-8", "replace")
         i, n = 0, len(s)
         while i < n:
             start = s.find("{", i)
@@ -56,7 +68,8 @@ if not os.path.exists(articles_path):
     raise SystemExit("Expected zendesk_export/articles.jsonl. Run export_zendesk_helpcenter.py first.")
 
 count = 0
-with open(articles_path, "r", encoding="utf-8") as f:
+made_dirs = set()  # directories already created this run
+with open(articles_path, "rb") as f:
     for a in iter_jsonl_robust(f):
         count += 1
         loc = (a.get("locale") or "en-us").lower()
@@ -67,41 +80,51 @@ with open(articles_path, "r", encoding="utf-8") as f:
 
         # Build file path
         path = f"docs/{loc}/{slugify(cat)}/{slugify(sec)}/{slugify(title)}.md"
-        pathlib.Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+        d = os.path.dirname(path)
+        if d not in made_dirs:
+            os.makedirs(d, exist_ok=True)
+            made_dirs.add(d)
 
         # Front matter (YAML) + content
+        page = (
+            "---\n"
+            f"title: '{safe_yaml_str(title)}'\n"
+            f"zendesk_url: {a.get('url')}\n"
+            f"article_id: {a.get('article_id')}\n"
+            f"locale: {safe_yaml_str(loc)}\n"
+            f"labels: {a.get('labels')}\n"
+            f"updated_at: {safe_yaml_str(a.get('updated_at'))}\n"
+            "---\n\n"
+            '<div class="zd-article">\n'
+            f"{html.strip()}\n"
+            "</div>\n"
+        )
         with open(path, "w", encoding="utf-8") as out:
-            out.write("---\n")
-            out.write(f'title: "{safe_yaml_str(title)}"\n')
-            out.write(f"zendesk_url: {a.get('url')}\n")
-            out.write(f"article_id: {a.get('article_id')}\n")
-            out.write(f"locale: {safe_yaml_str(loc)}\n")
-            out.write(f"labels: {a.get('labels')}\n")
-            out.write(f"updated_at: {safe_yaml_str(a.get('updated_at'))}\n")
-            breadcrumbs = f'{a.get("category_name") or ""} > {a.get("section_name") or ""}'
-            out.write('<div class="zd-article">\n')
-            out.write((html or "").strip())
-            out.write("\n</div>\n")
+            out.write(page)
 
         nav.setdefault(loc, {}).setdefault(cat, {}).setdefault(sec, []).append(
             (title, path.replace("docs/", ""))
         )
 
 # Write mkdocs.yml with fully quoted keys
+parts = [
+    "site_name: Montrium Help Center (Public Mirror)\n",
+    'site_url: "https://cmantz23-ship-it.github.io/helpcenter-mirror/"\n',
+    "theme:\n  name: material\n",
+    "extra_css:\n  - assets/zd.css\n",
+    "plugins:\n  - search\n",
+    "nav:\n",
+]
+for loc, cats in sorted(nav.items()):
+    parts.append(f"  - '{safe_yaml_str(loc)}':\n")
+    for cat, secs in sorted(cats.items()):
+        parts.append(f"    - '{safe_yaml_str(cat)}':\n")
+        for sec, items in sorted(secs.items()):
+            parts.append(f"      - '{safe_yaml_str(sec)}':\n")
+            for title, relpath in sorted(items):
+                parts.append(f"        - '{safe_yaml_str(title)}': '{safe_yaml_str(relpath)}'\n")
+
 with open("mkdocs.yml", "w", encoding="utf-8") as cfg:
-    cfg.write("site_name: Montrium Help Center (Public Mirror)\n")
-    cfg.write('site_url: "https://cmantz23-ship-it.github.io/helpcenter-mirror/"\n')
-    cfg.write("theme:\n  name: material\n")
-    cfg.write("extra_css:\n  - assets/zd.css\n")
-    cfg.write("plugins:\n  - search\n")
-    cfg.write("nav:\n")
-    for loc, cats in sorted(nav.items()):
-        cfg.write(f'  - "{safe_yaml_str(loc)}":\n')
-        for cat, secs in sorted(cats.items()):
-            cfg.write(f'    - "{safe_yaml_str(cat)}":\n')
-            for sec, items in sorted(secs.items()):
-                cfg.write(f'      - "{safe_yaml_str(sec)}":\n')
-                for title, relpath in sorted(items):
-                    cfg.write(f'        - "{safe_yaml_str(title)}": "{safe_yaml_str(relpath)}"\n')
+    cfg.write("".join(parts))
 
 print(f"mkdocs.yml written and docs/ populated with {count} articles.")
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+
+for mod in ("httpx", "orjson", "bs4", "tenacity"):
+    pytest.importorskip(mod)
+
+os.environ.setdefault("ZENDESK_SUBDOMAIN", "example")
+os.environ.setdefault("ZENDESK_EMAIL", "user@example.com/token")
+os.environ.setdefault("ZENDESK_API_TOKEN", "token")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export_zendesk_helpcenter as ez  # noqa: E402
+
+
+def test_word_split_chunks_respect_max_and_land_near_target():
+    # No sentence punctuation, so oversized text falls back to the word level
+    md = " | ".join("cell%d" % i for i in range(3000))
+    chunks = ez.chunk_text(md, target_tokens=800, max_tokens=1200)
+    sizes = [ez.num_tokens(c) for c in chunks]
+    assert all(t <= 1200 * 1.05 for t in sizes)
+    # Every chunk but the tail should be packed close to the target
+    assert all(t >= 800 * 0.85 for t in sizes[:-1])
+    assert len(chunks) <= -(-ez.num_tokens(md) // 800) + 1
+
+
+def test_chunks_rejoin_to_source_text():
+    md = "# Title\n\n" + "\n\n".join(" ".join("w%d" % j for j in range(n)) for n in (50, 2500, 10, 4000))
+    chunks = ez.chunk_text(md, target_tokens=800, max_tokens=1200)
+    assert "".join(md.split()) == "".join("".join(chunks).split())
+    assert all(ez.num_tokens(c) <= 1200 * 1.05 for c in chunks)
+
+
+def _para(n_tokens):
+    # Plain-prose paragraph of at least `n_tokens` under the active tokenizer
+    words = []
+    while ez.num_tokens(" ".join(words)) < n_tokens:
+        words.extend(["alpha", "beta", "gamma", "delta", "report."])
+    return " ".join(words)
+
+
+def test_tiny_tail_chunk_is_folded_into_neighbour():
+    md = "\n\n".join([_para(900), _para(900), _para(30)])
+    chunks = ez.chunk_text(md, target_tokens=800, max_tokens=1200, min_tokens=100)
+    assert len(chunks) == 2
+    assert chunks[-1].endswith(_para(30))
+    assert all(ez.num_tokens(c) <= 1200 * 1.05 for c in chunks)
+
+
+def test_tiny_chunk_not_folded_past_max_slack():
+    md = "\n\n".join([_para(1180), _para(95)])
+    chunks = ez.chunk_text(md, target_tokens=800, max_tokens=1200, min_tokens=100)
+    assert len(chunks) == 2
+    assert chunks[-1] == _para(95)
+
+
+def test_heading_boundaries_preferred_over_paragraphs():
+    section_a = "# A\n\n" + "\n\n".join(_para(220) for _ in range(3))
+    section_b = "## B\n\n" + "\n\n".join(_para(220) for _ in range(3))
+    chunks = ez.chunk_text(section_a + "\n" + section_b, target_tokens=800, max_tokens=1200)
+    # A paragraph-level pack would fill the first chunk to ~800 tokens with
+    # part of section B; the heading split keeps each section whole instead
+    assert len(chunks) == 2
+    assert chunks[0].startswith("# A") and "## B" not in chunks[0]
+    assert chunks[1].startswith("## B")